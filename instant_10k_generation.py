@@ -1,228 +1,269 @@
 #!/usr/bin/env python3
 """
-Instant 10,000 offer letters generation using multiple parallel streams
+Instant 10,000 offer letters generation using a single flat process pool
 """
 
 import os
+import argparse
 import time
 import json
 import shutil
-from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
-from multiprocessing import cpu_count
-import subprocess
+import sys
+import tempfile
 import threading
-import psutil
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from multiprocessing import cpu_count, Value
 from datetime import datetime
+from latex_generator import LaTeXGenerator
 
-class Instant10KGenerator:
-    """Generate 10,000 offer letters using multiple parallel streams"""
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+def _peak_rss_mb(include_children: bool = False) -> float:
+    """Peak resident set size of this process (plus reaped children) in MB"""
+    if resource is None:
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if include_children:
+        rss += resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KB elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return rss / divisor
+
+def _json_dumps_pretty(obj) -> bytes:
+    """Serialize obj to indented UTF-8 JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Per-worker caches, populated once per process by _init_worker
+_BASE_DATA = None
+_TEMPLATE_OBJ = None
+_RESOURCE_SRC = None
+_GEN = None
+_WORK_DIR = None
+_OUTPUT_ROOT = None
+_PROGRESS = None
+
+def _scratch_root() -> Path:
+    """Create a private scratch directory for one run (tmpfs on Linux, system temp elsewhere)"""
+    base = "/dev/shm" if sys.platform.startswith("linux") and os.path.isdir("/dev/shm") else None
+    # mkdtemp gives each run its own unpredictable folder, so concurrent runs (e.g. separate
+    # --start slices) never share or delete each other's intermediates
+    return Path(tempfile.mkdtemp(prefix="instant_10k_", dir=base))
+
+def _pin_to_core(slot_counter, cores: list):
+    """Bind this worker (and the compilers it launches) to its own core from the allowed set"""
+    with slot_counter.get_lock():
+        slot = slot_counter.value
+        slot_counter.value += 1
+    os.sched_setaffinity(0, {cores[slot % len(cores)]})
+
+def _load_shared_inputs():
+    """Load the base data, resource location, generator and compiled template into module globals"""
+    global _BASE_DATA, _TEMPLATE_OBJ, _RESOURCE_SRC, _GEN
+    _BASE_DATA = _json_loads(Path("offer-letters/data.json").read_bytes())
+    resources = Path("offer-letters/resources")
+    _RESOURCE_SRC = resources.resolve() if resources.is_dir() else None
+    _GEN = LaTeXGenerator()
+    _TEMPLATE_OBJ = _GEN.compile_template(Path("offer-letters/template.tex").read_text(encoding='utf-8'))
+
+def _init_worker(work_root: Path, output_root: Path, slot_counter=None, cores=None, progress_counter=None):
+    """Prepare a worker process; loads the shared inputs only if they were not inherited via fork"""
+    if slot_counter is not None and cores:
+        _pin_to_core(slot_counter, cores)
     
-    def __init__(self):
-        self.total_documents = 10000
-        self.base_json_file = Path("offer-letters/data.json")
-        self.output_dir = Path("instant_10k_output")
-        self.cpu_cores = cpu_count()
-        
-        # Create output directory
-        self.output_dir.mkdir(exist_ok=True)
-        
-        # Calculate optimal configuration
-        self.num_streams = min(self.cpu_cores // 2, 8)  # Number of parallel streams
-        self.docs_per_stream = self.total_documents // self.num_streams
-        self.workers_per_stream = self.cpu_cores * 2  # Workers per stream
-        
-        print(f"⚡ INSTANT 10K GENERATION CONFIGURATION")
-        print(f"🖥️  CPU Cores: {self.cpu_cores}")
-        print(f"🔄 Parallel Streams: {self.num_streams}")
-        print(f"📊 Documents per Stream: {self.docs_per_stream}")
-        print(f"👥 Workers per Stream: {self.workers_per_stream}")
-        print(f"🚀 Total Parallel Workers: {self.num_streams * self.workers_per_stream}")
+    if _GEN is None:
+        _load_shared_inputs()
     
-    def generate_stream(self, stream_id: int, start_doc_id: int, end_doc_id: int) -> dict:
-        """Generate documents for a single stream"""
-        import subprocess
-        import json
-        from datetime import datetime
-        
-        stream_start_time = time.time()
-        
-        # Create stream-specific output directory
-        stream_output_dir = self.output_dir / f"stream_{stream_id}"
-        stream_output_dir.mkdir(exist_ok=True)
-        
-        # Create a temporary script for this stream
-        script_content = f'''
-import os
-import time
-import json
-import shutil
-from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from latex_generator import LaTeXGenerator
+    global _WORK_DIR, _OUTPUT_ROOT, _PROGRESS
+    _OUTPUT_ROOT = output_root
+    _PROGRESS = progress_counter
+    
+    # One scratch folder per worker, reused for every document it builds
+    _WORK_DIR = work_root / f"worker_{os.getpid()}"
+    _WORK_DIR.mkdir(parents=True, exist_ok=True)
+    if _RESOURCE_SRC is not None:
+        _link_resources(_WORK_DIR / "resources")
 
-def generate_single_doc(doc_id):
+def _link_resources(target: Path):
+    """Point target at the shared resources folder, copying only where symlinks are unavailable"""
+    if os.path.lexists(target):
+        return
     try:
-        generator = LaTeXGenerator()
-        
-        # Load base data
-        with open("offer-letters/data.json", 'r') as f:
-            base_data = json.load(f)
-        
-        # Create output directory
-        output_dir = Path("instant_10k_output/stream_{stream_id}/doc_{{doc_id:06d}}".format(doc_id=doc_id))
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Create unique data
-        unique_data = base_data.copy()
-        unique_data['document_id'] = f"OL-{{doc_id:06d}}"
-        unique_data['employee_id'] = f"EMP-{{doc_id:06d}}"
-        
-        if 'employee_name' in unique_data:
-            unique_data['employee_name'] = f"{{unique_data['employee_name']}} {{doc_id:06d}}"
-        
-        # Save data file
-        with open(output_dir / "data.json", 'w') as f:
-            json.dump(unique_data, f, indent=2)
+        os.symlink(_RESOURCE_SRC, target, target_is_directory=True)
+    except OSError:
+        # e.g. Windows without symlink privilege
+        shutil.copytree(_RESOURCE_SRC, target, dirs_exist_ok=True)
+
+def generate_single_doc(doc_id: int) -> tuple:
+    """
+    Generate a single offer letter; module-level so worker processes can unpickle it.
+    
+    Returns (doc_id, None) on success and (doc_id, error_message) on failure, so
+    successful documents send no error payload back to the parent.
+    """
+    try:
+        # Create unique data in one merge rather than copy-then-assign
+        unique_data = {
+            **_BASE_DATA,
+            'document_id': f"OL-{doc_id:06d}",
+            'employee_id': f"EMP-{doc_id:06d}",
+        }
         
-        # Copy template
-        shutil.copy2("offer-letters/template.tex", output_dir / "template.tex")
+        if 'employee_name' in _BASE_DATA:
+            unique_data['employee_name'] = f"{_BASE_DATA['employee_name']} {doc_id:06d}"
         
-        # Copy resources if exists
-        if Path("offer-letters/resources").exists():
-            shutil.copytree("offer-letters/resources", output_dir / "resources", dirs_exist_ok=True)
+        # Render with the worker's precompiled template and compile in its scratch folder;
+        # intermediates are overwritten by the next document, only the PDF reaches durable storage
+        latex_file = _WORK_DIR / "doc.tex"
+        latex_file.write_text(_TEMPLATE_OBJ.render(unique_data), encoding='utf-8')
+        if not _GEN.compile_latex_to_pdf(latex_file, _WORK_DIR):
+            raise Exception("PDF compilation failed")
         
-        # Generate document
-        pdf_path = generator.generate_document_from_folder(
-            json_file=output_dir / "data.json",
-            template_name="template.tex",
-            output_dir=output_dir
-        )
+        shutil.move(_WORK_DIR / "doc.pdf", _OUTPUT_ROOT / f"doc_{doc_id:06d}.pdf")
         
-        return (doc_id, True, "")
+        return doc_id, None
     except Exception as e:
-        return (doc_id, False, str(e))
+        return doc_id, str(e)
+    finally:
+        if _PROGRESS is not None:
+            with _PROGRESS.get_lock():
+                _PROGRESS.value += 1
 
-# Generate documents for this stream
-start_time = time.time()
-doc_ids = range({start_doc_id}, {end_doc_id + 1})
-successful = 0
-failed = 0
-
-with ThreadPoolExecutor(max_workers={self.workers_per_stream}) as executor:
-    futures = {{executor.submit(generate_single_doc, doc_id): doc_id for doc_id in doc_ids}}
+class Instant10KGenerator:
+    """Generate 10,000 offer letters using a single flat process pool"""
     
-    for future in as_completed(futures):
-        doc_id, success, error = future.result()
-        if success:
-            successful += 1
+    def __init__(self,
+                 total_documents: int = 10000,
+                 start_doc_id: int = 1,
+                 num_workers: int = None,
+                 chunksize: int = 64):
+        """
+        Args:
+            total_documents (int): Number of documents to generate
+            start_doc_id (int): First document id, so a run can cover one slice of a larger batch
+            num_workers (int, optional): Worker processes (defaults to one per available core)
+            chunksize (int): Documents handed to a worker per task to amortize pickling
+        """
+        self.total_documents = total_documents
+        self.start_doc_id = start_doc_id
+        self.base_json_file = Path("offer-letters/data.json")
+        self.output_dir = Path("instant_10k_output")
+        self.work_dir = None  # Created per run by run_instant_generation
+        # Respect the CPU set this process may run on (cgroups, taskset); pinning needs Linux
+        if hasattr(os, "sched_getaffinity"):
+            self.cores = sorted(os.sched_getaffinity(0))
+            self.cpu_cores = len(self.cores)
         else:
-            failed += 1
-
-end_time = time.time()
-total_time = end_time - start_time
-
-# Save stream results
-results = {{
-    "stream_id": {stream_id},
-    "start_doc_id": {start_doc_id},
-    "end_doc_id": {end_doc_id},
-    "total_docs": {end_doc_id - start_doc_id + 1},
-    "successful": successful,
-    "failed": failed,
-    "total_time": total_time,
-    "docs_per_second": (successful + failed) / total_time if total_time > 0 else 0
-}}
-
-with open("instant_10k_output/stream_{stream_id}/results.json", 'w') as f:
-    json.dump(results, f, indent=2)
-
-print(f"Stream {stream_id} completed: {{successful}}/{{successful + failed}} documents in {{total_time:.2f}}s")
-'''
+            self.cores = None
+            self.cpu_cores = cpu_count()
         
-        # Write temporary script
-        script_file = stream_output_dir / f"stream_{stream_id}_script.py"
-        with open(script_file, 'w') as f:
-            f.write(script_content)
+        # Create output directory
+        self.output_dir.mkdir(exist_ok=True)
         
-        # Execute the script
-        try:
-            result = subprocess.run([
-                'python', str(script_file)
-            ], capture_output=True, text=True, cwd=os.getcwd())
-            
-            # Load results
-            results_file = stream_output_dir / "results.json"
-            if results_file.exists():
-                with open(results_file, 'r') as f:
-                    stream_results = json.load(f)
-                return stream_results
-            else:
-                return {
-                    "stream_id": stream_id,
-                    "error": "No results file generated",
-                    "stdout": result.stdout,
-                    "stderr": result.stderr
-                }
-        except Exception as e:
-            return {
-                "stream_id": stream_id,
-                "error": str(e)
-            }
+        # One worker process per core by default; more processes only oversubscribe
+        self.num_workers = num_workers or self.cpu_cores
+        self.chunksize = chunksize
+        self.progress_interval = 5.0  # Seconds between progress reports
+        
+        print(f"⚡ INSTANT 10K GENERATION CONFIGURATION")
+        print(f"🖥️  CPU Cores: {self.cpu_cores}")
+        print(f"📊 Documents: {self.start_doc_id:,} - {self.start_doc_id + self.total_documents - 1:,}")
+        print(f"👥 Worker Processes: {self.num_workers}")
+        print(f"📌 Core Pinning: {'enabled' if self.cores else 'unavailable'}")
+        print(f"📦 Chunk Size: {self.chunksize}")
+    
+    def _report_progress(self, counter, stop: threading.Event):
+        """Print the shared completed-document counter until stop is set"""
+        while not stop.wait(self.progress_interval):
+            done = counter.value
+            print(f"📈 Progress: {done:,}/{self.total_documents:,} "
+                  f"({done / self.total_documents * 100:.1f}%)", flush=True)
     
     def run_instant_generation(self):
-        """Run the instant generation using multiple parallel streams"""
+        """Run the instant generation using a single flat process pool"""
         print(f"\n🚀 STARTING INSTANT 10K GENERATION")
         print(f"⏰ Start time: {datetime.now().strftime('%H:%M:%S')}")
         print("="*80)
         
         # Record initial system state
-        initial_memory = psutil.virtual_memory().used / 1024 / 1024  # MB
+        initial_memory = _peak_rss_mb()
         start_time = time.time()
         
-        # Create stream ranges
-        streams = []
-        for i in range(self.num_streams):
-            start_doc = i * self.docs_per_stream + 1
-            end_doc = min((i + 1) * self.docs_per_stream, self.total_documents)
-            streams.append((i, start_doc, end_doc))
-        
-        print(f"📊 Stream Configuration:")
-        for i, start_doc, end_doc in streams:
-            print(f"   Stream {i}: Documents {start_doc:,} - {end_doc:,} ({end_doc - start_doc + 1:,} docs)")
+        total_successful = 0
+        total_failed = 0
+        failed_docs = []
+        progress_counter = Value('i', 0)
+        stop_progress = threading.Event()
         
-        # Launch all streams in parallel
-        print(f"\n🔥 LAUNCHING {self.num_streams} PARALLEL STREAMS...")
-        
-        with ProcessPoolExecutor(max_workers=self.num_streams) as executor:
-            future_to_stream = {
-                executor.submit(self.generate_stream, stream_id, start_doc, end_doc): stream_id
-                for stream_id, start_doc, end_doc in streams
-            }
+        # Created here rather than in __init__, and removed in the finally below even when
+        # loading the inputs fails, so no run leaves a folder behind in /dev/shm
+        self.work_dir = _scratch_root()
+        print(f"🗂️  Scratch Directory: {self.work_dir}")
+        try:
+            # On Linux, fork and load the shared inputs once here so workers inherit them
+            # copy-on-write. Elsewhere keep the platform default (fork is unsafe on macOS) and
+            # load them in the worker initializer
+            if sys.platform.startswith("linux"):
+                mp_context = multiprocessing.get_context("fork")
+                _load_shared_inputs()
+            else:
+                mp_context = None
+            
+            print(f"\n🔥 LAUNCHING {self.num_workers} WORKER PROCESSES...")
             
-            # Wait for all streams to complete
-            stream_results = []
-            for future in as_completed(future_to_stream):
-                stream_result = future.result()
-                stream_results.append(stream_result)
+            with ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(self.work_dir, self.output_dir, Value('i', 0), self.cores, progress_counter)
+            ) as executor:
+                doc_ids = range(self.start_doc_id, self.start_doc_id + self.total_documents)
+                results = executor.map(generate_single_doc, doc_ids, chunksize=self.chunksize)
                 
-                if 'error' not in stream_result:
-                    print(f"✅ Stream {stream_result['stream_id']} completed: "
-                          f"{stream_result['successful']} docs in {stream_result['total_time']:.2f}s "
-                          f"({stream_result['docs_per_second']:.2f} docs/sec)")
-                else:
-                    print(f"❌ Stream {stream_result['stream_id']} failed: {stream_result['error']}")
+                # Started after map() has submitted every chunk, so no worker is forked mid-report
+                monitor = threading.Thread(target=self._report_progress,
+                                           args=(progress_counter, stop_progress), daemon=True)
+                monitor.start()
+                try:
+                    for doc_id, error in results:
+                        if error is None:
+                            total_successful += 1
+                        else:
+                            total_failed += 1
+                            failed_docs.append({"doc_id": doc_id, "error": error})
+                finally:
+                    stop_progress.set()
+                    monitor.join()
+        finally:
+            # Drop this run's scratch folder, per-worker folders included
+            shutil.rmtree(self.work_dir, ignore_errors=True)
         
         end_time = time.time()
         total_time = end_time - start_time
-        final_memory = psutil.virtual_memory().used / 1024 / 1024  # MB
+        final_memory = _peak_rss_mb(include_children=True)  # Workers have been reaped by now
         
         # Calculate overall statistics
-        total_successful = sum(r.get('successful', 0) for r in stream_results if 'error' not in r)
-        total_failed = sum(r.get('failed', 0) for r in stream_results if 'error' not in r)
         total_processed = total_successful + total_failed
         
         overall_docs_per_second = total_processed / total_time if total_time > 0 else 0
+        success_rate = (total_successful / total_processed) * 100 if total_processed else 0.0
         memory_used = final_memory - initial_memory
         
         # Print final results
@@ -233,11 +274,10 @@ print(f"Stream {stream_id} completed: {{successful}}/{{successful + failed}} doc
         print(f"📊 Total Documents: {total_processed:,}")
         print(f"✅ Successful: {total_successful:,}")
         print(f"❌ Failed: {total_failed:,}")
-        print(f"📈 Success Rate: {(total_successful/total_processed)*100:.1f}%")
+        print(f"📈 Success Rate: {success_rate:.1f}%")
         print(f"🚀 Overall Speed: {overall_docs_per_second:.2f} docs/second")
-        print(f"💾 Memory Used: {memory_used:.1f} MB")
-        print(f"🔄 Parallel Streams: {self.num_streams}")
-        print(f"👥 Total Workers: {self.num_streams * self.workers_per_stream}")
+        print(f"💾 Peak Memory Used: {memory_used:.1f} MB")
+        print(f"👥 Total Workers: {self.num_workers}")
         
         # Performance rating
         if total_time < 60:
@@ -262,26 +302,56 @@ print(f"Stream {stream_id} completed: {{successful}}/{{successful + failed}} doc
             "total_documents": total_processed,
             "successful": total_successful,
             "failed": total_failed,
-            "success_rate": (total_successful/total_processed)*100,
+            "success_rate": success_rate,
             "docs_per_second": overall_docs_per_second,
             "memory_used_mb": memory_used,
-            "num_streams": self.num_streams,
-            "total_workers": self.num_streams * self.workers_per_stream,
-            "stream_results": stream_results,
+            "total_workers": self.num_workers,
+            "failed_docs": failed_docs,
             "timestamp": datetime.now().isoformat()
         }
         
-        with open(self.output_dir / "overall_results.json", 'w') as f:
-            json.dump(overall_results, f, indent=2)
+        (self.output_dir / "overall_results.json").write_bytes(_json_dumps_pretty(overall_results))
         
         return overall_results
 
 def main():
     """Main function"""
-    print("⚡ INSTANT 10,000 OFFER LETTERS GENERATION")
+    parser = argparse.ArgumentParser(
+        description="Generate offer letters in parallel with a single process pool",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Generate the default 10,000 documents
+  python instant_10k_generation.py
+  
+  # Generate documents 5,001 - 10,000 with 8 workers
+  python instant_10k_generation.py -n 5000 --start 5001 -w 8
+        """
+    )
+    parser.add_argument('-n', '--documents', type=int, default=10000,
+                       help='Number of documents to generate (default: 10000)')
+    parser.add_argument('--start', type=int, default=1,
+                       help='First document id (default: 1)')
+    parser.add_argument('-w', '--workers', type=int,
+                       help='Worker processes (default: one per available core)')
+    parser.add_argument('--chunksize', type=int, default=64,
+                       help='Documents handed to a worker per task (default: 64)')
+    args = parser.parse_args()
+    
+    for option, value in (("--documents", args.documents), ("--start", args.start),
+                          ("--workers", args.workers), ("--chunksize", args.chunksize)):
+        if value is not None and value < 1:
+            parser.error(f"{option} must be at least 1 (got {value})")
+    
+    print(f"⚡ INSTANT {args.documents:,} OFFER LETTERS GENERATION")
     print("="*60)
     
-    generator = Instant10KGenerator()
+    generator = Instant10KGenerator(
+        total_documents=args.documents,
+        start_doc_id=args.start,
+        num_workers=args.workers,
+        chunksize=args.chunksize
+    )
     
     try:
         results = generator.run_instant_generation()
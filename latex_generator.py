@@ -6,17 +6,147 @@ Supports folder-based document organization where each document type has its own
 
 import json
 import os
+import re
 import sys
-import argparse
+import functools
+import threading
+from collections import OrderedDict
+from itertools import repeat
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Union, Optional
-from jinja2 import Environment, FileSystemLoader, Template
+from typing import Dict, Any, Iterable, Union, Optional
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, Template
 import logging
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib parser
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Document folders whose environments (and compiled templates) are kept per generator
+_MAX_FOLDER_ENVS = 64
+
+# LaTeX special characters and their escaped forms, replaced in a single pass
+_LATEX_ESCAPE_MAP = {
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '^': r'\textasciicircum{}',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+}
+_LATEX_ESCAPE_RE = re.compile('|'.join(re.escape(char) for char in _LATEX_ESCAPE_MAP))
+
+# Directories already created by this process, so repeated writes skip the mkdir syscall
+_ENSURED_DIRS = set()
+
+def _ensure_dir(path: Path, verify: bool = False) -> None:
+    """Create path (and parents) unless this process has already done so.
+    
+    Pass verify=True where a directory removed since it was cached would only fail inside
+    a subprocess (e.g. Tectonic's --outdir) instead of raising FileNotFoundError here.
+    """
+    key = os.path.abspath(path)
+    if verify or key not in _ENSURED_DIRS:
+        Path(key).mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(key)
+
+def _recreate_parent(path: Union[str, Path]) -> None:
+    """Recreate the parent of path after a write found it missing (removed since it was cached)."""
+    _ensure_dir(os.path.dirname(os.path.abspath(path)), verify=True)
+
+def _read_json(path: Union[str, Path]) -> Any:
+    """Parse a JSON file from its raw bytes, using orjson when it is installed."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _write_text(path: Union[str, Path], content: str) -> None:
+    """Write content as UTF-8 with unbuffered os.write calls, normally a single syscall."""
+    data = memoryview(content.encode('utf-8'))
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    try:
+        fd = os.open(path, flags, 0o666)
+    except FileNotFoundError:
+        _recreate_parent(path)
+        fd = os.open(path, flags, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+def _stream_to_file(template: Template, data: Dict[str, Any], path: Union[str, Path]) -> None:
+    """Render template chunk by chunk into path, never holding the full document in memory.
+    
+    Chunks go to a temporary file beside path, which replaces path only once rendering has
+    finished, so a template error midway leaves an existing file untouched.
+    """
+    tmp_path = f"{os.path.abspath(path)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        f = open(tmp_path, 'wb', buffering=1 << 20)
+    except FileNotFoundError:
+        _recreate_parent(path)
+        f = open(tmp_path, 'wb', buffering=1 << 20)
+    try:
+        with f:
+            template.stream(data).dump(f, encoding='utf-8')
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+@functools.lru_cache(maxsize=1)
+def _find_tectonic() -> Optional[str]:
+    """Resolve the Tectonic executable on PATH once per process."""
+    import shutil
+    return shutil.which("tectonic")
+
+@functools.lru_cache(maxsize=4096)
+def _escape_latex_text(text: str) -> str:
+    """Escape LaTeX special characters in a string (memoized; templates repeat the same values)."""
+    # One pass over the text, so replacements are never themselves re-escaped
+    return _LATEX_ESCAPE_RE.sub(lambda match: _LATEX_ESCAPE_MAP[match.group()], text)
+
+# Accepted input date formats as (pattern, candidate orderings of the groups into datetime
+# arguments); numeric dates try month-first (%m/%d/%Y) before day-first (%d/%m/%Y)
+_DATE_PATTERNS = [
+    (re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})'), ((0, 1, 2),)),
+    (re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})'), ((2, 0, 1), (2, 1, 0))),
+    (re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2}) (\d{1,2}):(\d{1,2}):(\d{1,2})'), ((0, 1, 2, 3, 4, 5),)),
+]
+
+@functools.lru_cache(maxsize=4096)
+def _format_date_text(date_str: str, format_str: str) -> str:
+    """Reformat a date string, returning it unchanged if no known format matches (memoized)."""
+    try:
+        for pattern, orderings in _DATE_PATTERNS:
+            match = pattern.fullmatch(date_str)
+            if match is None:
+                continue
+            parts = [int(group) for group in match.groups()]
+            for order in orderings:
+                try:
+                    return datetime(*(parts[i] for i in order)).strftime(format_str)
+                except ValueError:
+                    continue
+        return date_str
+    except Exception:
+        return date_str
+
 class LaTeXGenerator:
     """
     Universal LaTeX document generator that populates LaTeX templates with JSON data using Jinja2.
@@ -30,36 +160,88 @@ class LaTeXGenerator:
             template_dir (Union[str, Path]): Directory containing LaTeX templates
             components_dir (Union[str, Path]): Directory containing LaTeX components
         """
+        # Directories are created lazily, on first write
         self.template_dir = Path(template_dir)
-        self.template_dir.mkdir(exist_ok=True)
-        
-        # Initialize components directory
         self.components_dir = Path(components_dir)
-        self.components_dir.mkdir(exist_ok=True)
         
         # Load components
         self.components = self._load_components()
+        self._component_templates: Dict[str, Template] = {}
+        
+        # Persist compiled template bytecode across runs; Jinja picks a per-user temp
+        # directory and invalidates entries when a template's source changes
+        self._bytecode_cache = FileSystemBytecodeCache()
+        
+        # Create Jinja2 environment for the template directory
+        self.env = self._create_environment(FileSystemLoader(self.template_dir))
+        
+        # Environments for recently used document folders, least recently used evicted first
+        self._folder_envs: "OrderedDict[Path, Environment]" = OrderedDict()
+        
+    def _create_environment(self, loader, **options) -> Environment:
+        """
+        Create a Jinja2 environment with LaTeX-safe delimiters, custom filters and components.
+        
+        Templates are not re-checked on disk once loaded (auto_reload=False), so edits to a
+        template file take effect in a new generator.
         
-        # Create Jinja2 environment with custom delimiters to avoid conflicts with LaTeX
-        self.env = Environment(
-            loader=FileSystemLoader(self.template_dir),
+        Args:
+            loader: Jinja2 template loader
+            **options: Extra Environment options
+            
+        Returns:
+            Environment: Configured Jinja2 environment
+        """
+        # Custom delimiters avoid conflicts with LaTeX
+        env = Environment(
+            loader=loader,
             variable_start_string='\\VAR{',
             variable_end_string='}',
             block_start_string='\\BLOCK{',
             block_end_string='}',
             comment_start_string='\\#{',
-            comment_end_string='}'
+            comment_end_string='}',
+            auto_reload=False,
+            bytecode_cache=self._bytecode_cache,
+            **options
         )
         
         # Add custom filters
-        self.env.filters['latex_escape'] = self._latex_escape
-        self.env.filters['currency'] = self._format_currency
-        self.env.filters['date_format'] = self._format_date
-        self.env.filters['image'] = self._format_image
+        env.filters['latex_escape'] = self._latex_escape
+        env.filters['currency'] = self._format_currency
+        env.filters['currency_list'] = self._format_currency_list
+        env.filters['date_format'] = self._format_date
+        env.filters['image'] = self._format_image
         
         # Add component functions
-        self.env.globals['component'] = self._get_component
-        self.env.globals['components'] = self.components
+        env.globals['component'] = self._get_component
+        env.globals['components'] = self.components
+        
+        return env
+    
+    def _env_for_folder(self, folder: Path) -> Environment:
+        """
+        Get the cached environment for a document folder, creating it on first use.
+        
+        Only the _MAX_FOLDER_ENVS most recently used folders are kept, so a batch with one
+        folder per document does not hold every compiled template for the generator's lifetime.
+        
+        Args:
+            folder (Path): Folder containing the document templates
+            
+        Returns:
+            Environment: Environment whose compiled templates persist across calls
+        """
+        key = Path(os.path.abspath(folder))
+        env = self._folder_envs.get(key)
+        if env is None:
+            env = self._create_environment(FileSystemLoader(key), cache_size=-1)
+            self._folder_envs[key] = env
+            if len(self._folder_envs) > _MAX_FOLDER_ENVS:
+                self._folder_envs.popitem(last=False)
+        else:
+            self._folder_envs.move_to_end(key)
+        return env
         
     def _load_components(self) -> Dict[str, str]:
         """
@@ -70,17 +252,21 @@ class LaTeXGenerator:
         """
         components = {}
         
-        if not self.components_dir.exists():
-            return components
-            
-        for component_file in self.components_dir.glob("*.tex"):
-            component_name = component_file.stem
-            try:
-                with open(component_file, 'r', encoding='utf-8') as f:
-                    components[component_name] = f.read()
-                logger.info(f"Loaded component: {component_name}")
-            except Exception as e:
-                logger.error(f"Error loading component {component_name}: {e}")
+        # scandir reports entry types from the directory listing, avoiding a stat per file
+        try:
+            with os.scandir(self.components_dir) as entries:
+                for entry in entries:
+                    if not (entry.name.endswith('.tex') and entry.is_file()):
+                        continue
+                    component_name = entry.name[:-4]
+                    try:
+                        with open(entry.path, 'r', encoding='utf-8', buffering=1 << 16) as f:
+                            components[component_name] = f.read()
+                        logger.info(f"Loaded component: {component_name}")
+                    except Exception as e:
+                        logger.error(f"Error loading component {component_name}: {e}")
+        except FileNotFoundError:
+            pass
                 
         return components
     
@@ -101,15 +287,15 @@ class LaTeXGenerator:
         
         component_content = self.components[component_name]
         
-        # If parameters are provided, treat the component as a Jinja template
+        # If parameters are provided, treat the component as a Jinja template,
+        # compiled once and reused for every later call
         if kwargs:
             try:
-                template = Template(component_content, 
-                                  variable_start_string='\\VAR{',
-                                  variable_end_string='}',
-                                  block_start_string='\\BLOCK{',
-                                  block_end_string='}')
-                return template.render(**kwargs)
+                template = self._component_templates.get(component_name)
+                if template is None:
+                    template = self.env.from_string(component_content)
+                    self._component_templates[component_name] = template
+                return template.render(kwargs)
             except Exception as e:
                 logger.error(f"Error rendering component {component_name}: {e}")
                 return f"% Error rendering component {component_name}: {e}"
@@ -135,8 +321,10 @@ class LaTeXGenerator:
             save_to_file (bool): Whether to save the component to a file
         """
         self.components[component_name] = latex_content
+        self._component_templates.pop(component_name, None)
         
         if save_to_file:
+            _ensure_dir(self.components_dir, verify=True)
             component_file = self.components_dir / f"{component_name}.tex"
             with open(component_file, 'w', encoding='utf-8') as f:
                 f.write(latex_content)
@@ -167,25 +355,7 @@ class LaTeXGenerator:
         if not isinstance(text, str):
             text = str(text)
             
-        # LaTeX special characters that need escaping
-        # Note: Order matters - escape backslash first to avoid double-escaping
-        latex_special_chars = [
-            ('\\', r'\textbackslash{}'),
-            ('&', r'\&'),
-            ('%', r'\%'),
-            ('$', r'\$'),
-            ('#', r'\#'),
-            ('^', r'\textasciicircum{}'),
-            ('_', r'\_'),
-            ('{', r'\{'),
-            ('}', r'\}'),
-            ('~', r'\textasciitilde{}'),
-        ]
-        
-        for char, replacement in latex_special_chars:
-            text = text.replace(char, replacement)
-            
-        return text
+        return _escape_latex_text(text)
     
     def _format_currency(self, amount: Union[int, float], currency: str = "\\$") -> str:
         """
@@ -198,7 +368,22 @@ class LaTeXGenerator:
         Returns:
             str: Formatted currency string
         """
-        return f"{currency}{amount:,.2f}"
+        return currency + format(amount, ',.2f')
+    
+    def _format_currency_list(self, amounts: Iterable[Union[int, float]], currency: str = "\\$",
+                              separator: str = ", ") -> str:
+        """
+        Format a sequence of numbers as currency and join them in one pass.
+        
+        Args:
+            amounts (Iterable[Union[int, float]]): Amounts to format
+            currency (str): Currency symbol (LaTeX-escaped)
+            separator (str): String placed between formatted amounts
+            
+        Returns:
+            str: Joined currency strings
+        """
+        return separator.join(currency + s for s in map(format, amounts, repeat(',.2f')))
     
     def _format_date(self, date_str: str, format_str: str = "%B %d, %Y") -> str:
         """
@@ -211,18 +396,9 @@ class LaTeXGenerator:
         Returns:
             str: Formatted date string
         """
-        try:
-            if isinstance(date_str, str):
-                # Try common date formats
-                for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S"]:
-                    try:
-                        date_obj = datetime.strptime(date_str, fmt)
-                        return date_obj.strftime(format_str)
-                    except ValueError:
-                        continue
-            return date_str
-        except Exception:
-            return date_str
+        if isinstance(date_str, str) and isinstance(format_str, str):
+            return _format_date_text(date_str, format_str)
+        return date_str
     
     def _format_image(self, image_path: str, *args, **kwargs) -> str:
         """
@@ -240,7 +416,11 @@ class LaTeXGenerator:
             image_path = str(image_path)
         
         # Escape path for LaTeX (handle backslashes for Windows paths)
-        escaped_path = image_path.replace('\\', '/')
+        escaped_path = image_path.replace('\\', '/') if '\\' in image_path else image_path
+        
+        # Common case: plain `x|image` with no options
+        if not args and not kwargs:
+            return f"\\includegraphics{{{escaped_path}}}"
         
         # Build options list from positional arguments
         options = []
@@ -271,8 +451,7 @@ class LaTeXGenerator:
             Dict[str, Any]: Loaded JSON data
         """
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(json_file)
             logger.info(f"Successfully loaded JSON data from {json_file}")
             return data
         except Exception as e:
@@ -282,7 +461,8 @@ class LaTeXGenerator:
     def generate_latex(self, 
                       template_name: str, 
                       data: Union[Dict[str, Any], str, Path], 
-                      output_file: Union[str, Path] = None) -> str:
+                      output_file: Union[str, Path] = None,
+                      return_content: bool = True) -> Optional[str]:
         """
         Generate LaTeX document from template and data.
         
@@ -290,25 +470,35 @@ class LaTeXGenerator:
             template_name (str): Name of the LaTeX template file
             data (Union[Dict[str, Any], str, Path]): JSON data or path to JSON file
             output_file (Union[str, Path], optional): Output file path
+            return_content (bool): Return the generated content; when False and output_file
+                is given, the document is streamed to the file instead of built in memory
             
         Returns:
-            str: Generated LaTeX content
+            Optional[str]: Generated LaTeX content, or None when return_content is False
         """
         try:
             # Load data if it's a file path
             if isinstance(data, (str, Path)):
                 data = self.load_json_data(data)
             
-            # Load and render template
+            # Load template
             template = self.env.get_template(template_name)
-            latex_content = template.render(**data)
+            
+            # Stream straight to the file when the caller does not need the content
+            if output_file and not return_content:
+                output_path = Path(output_file)
+                _ensure_dir(output_path.parent)
+                _stream_to_file(template, data, output_path)
+                logger.info(f"LaTeX document saved to {output_path}")
+                return None
+            
+            latex_content = template.render(data)
             
             # Save to file if output_file is specified
             if output_file:
                 output_path = Path(output_file)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(latex_content)
+                _ensure_dir(output_path.parent)
+                _write_text(output_path, latex_content)
                 logger.info(f"LaTeX document saved to {output_path}")
             
             return latex_content
@@ -339,14 +529,13 @@ class LaTeXGenerator:
             
             # Create template from string
             template = self.env.from_string(template_content)
-            latex_content = template.render(**data)
+            latex_content = template.render(data)
             
             # Save to file if output_file is specified
             if output_file:
                 output_path = Path(output_file)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(latex_content)
+                _ensure_dir(output_path.parent)
+                _write_text(output_path, latex_content)
                 logger.info(f"LaTeX document saved to {output_path}")
             
             return latex_content
@@ -355,7 +544,21 @@ class LaTeXGenerator:
             logger.error(f"Error generating LaTeX document from string template: {e}")
             raise
     
-    def compile_latex_to_pdf(self, latex_file: Union[str, Path], output_dir: Union[str, Path] = None) -> bool:
+    def compile_template(self, template_content: str) -> Template:
+        """
+        Compile a template string once so it can be rendered many times.
+        
+        Args:
+            template_content (str): LaTeX template content as string
+            
+        Returns:
+            Template: Compiled template bound to this generator's filters and components
+        """
+        return self.env.from_string(template_content)
+    
+    def compile_latex_to_pdf(self, 
+                            latex_file: Union[str, Path], 
+                            output_dir: Union[str, Path] = None) -> bool:
         """
         Compile LaTeX file to PDF using Tectonic.
         
@@ -370,62 +573,145 @@ class LaTeXGenerator:
             import subprocess
             import shutil
             
-            latex_path = Path(latex_file)
-            if not latex_path.exists():
+            # Work on absolute path strings computed once; abspath is a pure string
+            # operation, unlike Path.resolve() which walks symlinks on disk
+            latex_path = os.path.abspath(latex_file)
+            if not os.path.exists(latex_path):
                 logger.error(f"LaTeX file {latex_path} does not exist")
                 return False
             
             # Check if Tectonic is available
-            if not shutil.which("tectonic"):
+            tectonic = _find_tectonic()
+            if not tectonic:
                 logger.error("Tectonic not found. Install with: brew install tectonic")
                 return False
             
             # Set working directory and output directory
-            work_dir = latex_path.parent
+            work_dir = os.path.dirname(latex_path)
             if output_dir:
-                output_path = Path(output_dir)
-                output_path.mkdir(parents=True, exist_ok=True)
+                output_path = os.path.abspath(output_dir)
+                _ensure_dir(output_path, verify=True)
             else:
                 output_path = work_dir
             
             # Build Tectonic command with absolute path
-            cmd = ["tectonic", str(latex_path.resolve())]
+            cmd = [tectonic, latex_path]
             
             # Determine if we need to move the PDF after compilation
             move_pdf = output_dir and output_path != work_dir
             
             # Run Tectonic compilation
             logger.info(f"Compiling with Tectonic: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=work_dir)
+            # Tectonic reports diagnostics on stderr; stdout is discarded and stderr is
+            # only decoded when compilation fails
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                    cwd=work_dir)
             
             if result.returncode == 0:
                 logger.info(f"Successfully compiled {latex_file} to PDF using Tectonic")
                 
                 # Move PDF if needed (Tectonic outputs to same directory as .tex file by default)
                 if move_pdf:
-                    pdf_name = latex_path.stem + ".pdf"
-                    src_pdf = work_dir / pdf_name
-                    dst_pdf = output_path / pdf_name
-                    if src_pdf.exists():
-                        shutil.move(str(src_pdf), str(dst_pdf))
+                    pdf_name = os.path.splitext(os.path.basename(latex_path))[0] + ".pdf"
+                    src_pdf = os.path.join(work_dir, pdf_name)
+                    dst_pdf = os.path.join(output_path, pdf_name)
+                    if os.path.exists(src_pdf):
+                        shutil.move(src_pdf, dst_pdf)
                         logger.info(f"Moved PDF to {dst_pdf}")
                 
                 return True
             else:
                 logger.error(f"Error compiling LaTeX with Tectonic:")
-                logger.error(f"STDOUT: {result.stdout}")
-                logger.error(f"STDERR: {result.stderr}")
+                logger.error(f"STDERR: {result.stderr.decode(errors='replace')}")
                 return False
                 
         except Exception as e:
             logger.error(f"Error compiling LaTeX to PDF: {e}")
             return False
 
+    def compile_template_to_pdf(self, 
+                                template: Template, 
+                                data: Dict[str, Any], 
+                                output_dir: Union[str, Path], 
+                                output_filename: str,
+                                work_dir: Union[str, Path] = None) -> bool:
+        """
+        Render a template and pipe it straight into Tectonic, without writing a .tex file.
+        
+        Tectonic names stdin input "texput", so concurrent calls must not share output_dir.
+        
+        Args:
+            template (Template): Compiled template to render
+            data (Dict[str, Any]): Template data
+            output_dir (Union[str, Path]): Output directory for the PDF
+            output_filename (str): PDF filename (without extension)
+            work_dir (Union[str, Path], optional): Directory relative resource paths resolve
+                against (defaults to output_dir)
+            
+        Returns:
+            bool: True if compilation successful, False otherwise
+        """
+        try:
+            import subprocess
+            import tempfile
+            
+            tectonic = _find_tectonic()
+            if not tectonic:
+                logger.error("Tectonic not found. Install with: brew install tectonic")
+                return False
+            
+            output_path = Path(output_dir)
+            _ensure_dir(output_path, verify=True)
+            work_dir = Path(work_dir) if work_dir is not None else output_path
+            
+            cmd = [tectonic, "-", "--outdir", os.path.abspath(output_path)]
+            
+            # stderr goes to a file rather than a pipe so a chatty compile cannot fill the pipe
+            # and deadlock against our writes to stdin
+            logger.info(f"Compiling with Tectonic: {' '.join(cmd)}")
+            with tempfile.TemporaryFile() as stderr_file:
+                proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                        stderr=stderr_file, cwd=work_dir)
+                try:
+                    template.stream(data).dump(proc.stdin, encoding='utf-8')
+                except BrokenPipeError:
+                    pass  # Tectonic exited early; its return code and stderr explain why
+                except BaseException:
+                    # Rendering failed: stop Tectonic before it compiles the truncated input
+                    proc.kill()
+                    proc.wait()
+                    try:
+                        os.remove(output_path / "texput.pdf")
+                    except FileNotFoundError:
+                        pass
+                    raise
+                finally:
+                    try:
+                        proc.stdin.close()
+                    except BrokenPipeError:
+                        pass
+                returncode = proc.wait()
+                
+                if returncode != 0:
+                    stderr_file.seek(0)
+                    logger.error(f"Error compiling LaTeX with Tectonic:")
+                    logger.error(f"STDERR: {stderr_file.read().decode('utf-8', errors='replace')}")
+                    return False
+            
+            os.replace(output_path / "texput.pdf", output_path / f"{output_filename}.pdf")
+            logger.info(f"Successfully compiled {output_filename}.pdf using Tectonic")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error compiling LaTeX to PDF: {e}")
+            return False
+
     def generate_pdf(self, 
                     template_name: str, 
                     data: Union[Dict[str, Any], str, Path], 
                     output_filename: str = None,
-                    output_dir: Union[str, Path] = "output") -> str:
+                    output_dir: Union[str, Path] = "output",
+                    keep_tex: bool = True) -> str:
         """
         Generate LaTeX document and compile to PDF.
         
@@ -434,6 +720,8 @@ class LaTeXGenerator:
             data (Union[Dict[str, Any], str, Path]): JSON data or path to JSON file
             output_filename (str, optional): Output filename (without extension)
             output_dir (Union[str, Path]): Output directory for files
+            keep_tex (bool): Keep the generated .tex next to the PDF; when False the document
+                is piped straight into Tectonic and never written to disk
             
         Returns:
             str: Path to generated PDF file
@@ -445,16 +733,24 @@ class LaTeXGenerator:
             
             # Ensure output directory exists
             output_path = Path(output_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
-            
-            # Generate LaTeX file
-            latex_filename = output_filename + ".tex"
-            latex_filepath = output_path / latex_filename
-            
-            latex_content = self.generate_latex(template_name, data, latex_filepath)
+            _ensure_dir(output_path)
             
-            # Compile to PDF
-            pdf_success = self.compile_latex_to_pdf(latex_filepath, output_path)
+            if keep_tex:
+                # Generate LaTeX file
+                latex_filename = output_filename + ".tex"
+                latex_filepath = output_path / latex_filename
+                
+                self.generate_latex(template_name, data, latex_filepath, return_content=False)
+                
+                # Compile to PDF
+                pdf_success = self.compile_latex_to_pdf(latex_filepath, output_path)
+            else:
+                # Load data if it's a file path
+                if isinstance(data, (str, Path)):
+                    data = self.load_json_data(data)
+                
+                template = self.env.get_template(template_name)
+                pdf_success = self.compile_template_to_pdf(template, data, output_path, output_filename)
             
             if pdf_success:
                 pdf_filepath = output_path / (output_filename + ".pdf")
@@ -469,7 +765,8 @@ class LaTeXGenerator:
     def generate_document_from_folder(self, 
                                     json_file: Union[str, Path], 
                                     template_name: str = None,
-                                    output_dir: Union[str, Path] = None) -> str:
+                                    output_dir: Union[str, Path] = None,
+                                    template_path: Union[str, Path] = None) -> str:
         """
         Generate PDF document from a folder-based structure.
         
@@ -477,6 +774,9 @@ class LaTeXGenerator:
             json_file (Union[str, Path]): Path to JSON data file
             template_name (str, optional): Template file name (defaults to template.tex)
             output_dir (Union[str, Path], optional): Output directory (defaults to same as JSON file)
+            template_path (Union[str, Path], optional): Template file read in place from any
+                location; overrides template_name so the template need not be copied next to
+                the JSON file
             
         Returns:
             str: Path to generated PDF file
@@ -489,12 +789,20 @@ class LaTeXGenerator:
             # Get the folder containing the JSON file
             document_folder = json_path.parent
             
-            # Default template name
-            if template_name is None:
-                template_name = "template.tex"
+            if template_path is not None:
+                # Use the given template where it lives
+                template_path = Path(template_path)
+                template_dir = template_path.parent
+                template_name = template_path.name
+            else:
+                # Default template name
+                if template_name is None:
+                    template_name = "template.tex"
+                
+                # Look for template in the same folder as JSON file
+                template_dir = document_folder
+                template_path = document_folder / template_name
             
-            # Look for template in the same folder as JSON file
-            template_path = document_folder / template_name
             if not template_path.exists():
                 raise FileNotFoundError(f"Template not found: {template_path}")
             
@@ -503,58 +811,97 @@ class LaTeXGenerator:
                 output_dir = document_folder
             else:
                 output_dir = Path(output_dir)
-                output_dir.mkdir(parents=True, exist_ok=True)
+                _ensure_dir(output_dir)
             
             # Load JSON data
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Create a temporary environment for this document folder
-            temp_env = Environment(
-                loader=FileSystemLoader(document_folder),
-                variable_start_string='\\VAR{',
-                variable_end_string='}',
-                block_start_string='\\BLOCK{',
-                block_end_string='}',
-                comment_start_string='\\#{',
-                comment_end_string='}'
-            )
-            
-            # Add all the same filters and globals
-            temp_env.filters['latex_escape'] = self._latex_escape
-            temp_env.filters['currency'] = self._format_currency
-            temp_env.filters['date_format'] = self._format_date
-            temp_env.filters['image'] = self._format_image
-            temp_env.globals['component'] = self._get_component
-            temp_env.globals['components'] = self.components
-            
-            # Load and render template
-            template = temp_env.get_template(template_name)
-            latex_content = template.render(**data)
-            
-            # Generate output filename
-            output_filename = json_path.stem
-            latex_file = output_dir / f"{output_filename}.tex"
-            
-            # Save LaTeX file
-            with open(latex_file, 'w', encoding='utf-8') as f:
-                f.write(latex_content)
-            logger.info(f"Generated LaTeX file: {latex_file}")
+            data = _read_json(json_path)
             
-            # Compile to PDF
-            pdf_success = self.compile_latex_to_pdf(latex_file, output_dir)
-            
-            if pdf_success:
-                pdf_file = output_dir / f"{output_filename}.pdf"
-                logger.info(f"Generated PDF file: {pdf_file}")
-                return str(pdf_file)
-            else:
-                raise Exception("PDF compilation failed")
+            return self._build_document(data, template_dir, template_name, output_dir,
+                                        json_path.stem)
                 
         except Exception as e:
             logger.error(f"Error generating document from folder: {e}")
             raise
 
+    def generate_document_from_data(self, 
+                                  data: Dict[str, Any], 
+                                  template_name: str = None,
+                                  output_dir: Union[str, Path] = ".",
+                                  template_dir: Union[str, Path] = None,
+                                  output_filename: str = "data") -> str:
+        """
+        Generate PDF document from in-memory data, without a JSON file on disk.
+        
+        Args:
+            data (Dict[str, Any]): Template data
+            template_name (str, optional): Template file name (defaults to template.tex)
+            output_dir (Union[str, Path]): Output directory for the .tex and .pdf files
+            template_dir (Union[str, Path], optional): Folder containing the template
+                (defaults to output_dir)
+            output_filename (str): Output filename (without extension)
+            
+        Returns:
+            str: Path to generated PDF file
+        """
+        try:
+            if template_name is None:
+                template_name = "template.tex"
+            
+            output_dir = Path(output_dir)
+            _ensure_dir(output_dir)
+            template_dir = Path(template_dir) if template_dir is not None else output_dir
+            
+            template_path = template_dir / template_name
+            if not template_path.exists():
+                raise FileNotFoundError(f"Template not found: {template_path}")
+            
+            return self._build_document(data, template_dir, template_name, output_dir,
+                                        output_filename)
+                
+        except Exception as e:
+            logger.error(f"Error generating document from data: {e}")
+            raise
+
+    def _build_document(self, 
+                        data: Dict[str, Any], 
+                        template_dir: Path, 
+                        template_name: str, 
+                        output_dir: Path, 
+                        output_filename: str) -> str:
+        """
+        Render a template from template_dir with data and compile the result to PDF.
+        
+        Returns:
+            str: Path to generated PDF file
+        """
+        # Load (or reuse the already compiled) template
+        template = self._env_for_folder(template_dir).get_template(template_name)
+        
+        latex_file = output_dir / f"{output_filename}.tex"
+        
+        # Render straight into the LaTeX file
+        _stream_to_file(template, data, latex_file)
+        logger.info(f"Generated LaTeX file: {latex_file}")
+        
+        # Compile to PDF
+        pdf_success = self.compile_latex_to_pdf(latex_file, output_dir)
+        
+        if pdf_success:
+            pdf_file = output_dir / f"{output_filename}.pdf"
+            logger.info(f"Generated PDF file: {pdf_file}")
+            return str(pdf_file)
+        else:
+            raise Exception("PDF compilation failed")
+
+@functools.lru_cache(maxsize=8)
+def _get_generator(template_dir: str, components_dir: str = "components") -> LaTeXGenerator:
+    """
+    Get a shared generator for a template/components directory pair.
+    
+    Reusing the instance keeps its loaded components and compiled templates warm across calls.
+    """
+    return LaTeXGenerator(template_dir, components_dir)
+
 # Convenience function for quick usage
 def generate_latex_document(template_file: str, 
                           data_file: str, 
@@ -572,13 +919,15 @@ def generate_latex_document(template_file: str,
     Returns:
         str: Generated LaTeX content
     """
-    generator = LaTeXGenerator(template_dir)
+    generator = _get_generator(template_dir, 'components')
     return generator.generate_latex(template_file, data_file, output_file)
 
 def main():
     """
     Command-line interface for the LaTeX generator.
     """
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Universal LaTeX document generator with folder-based organization",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -4,137 +4,689 @@ System specifications checker for optimal parallelism
 """
 
 import psutil
+import argparse
 import os
+import bisect
+import errno
+import contextlib
+import functools
+import json
+import logging
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import cpu_count
 from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
 import subprocess
 
-def check_system_specs():
-    """Check system specifications and recommend optimal settings"""
-    print("🖥️  SYSTEM SPECIFICATIONS")
-    print("="*50)
+try:
+    import resource
+except ImportError:  # Windows has no getrusage
+    resource = None  # type: ignore[assignment]
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Linux-only optional dependency; progress falls back to scanning
+    INotify = None
+
+# Where scale tests write their PDFs; disk checks measure the filesystem holding it
+OUTPUT_DIR = Path("scale_test_output")
+
+# Measured single-worker throughput, keyed by machine, so repeat runs skip the probe
+THROUGHPUT_CACHE_FILE = Path.home() / ".cache" / "doc-builder" / "throughput.json"
+
+# Tier tables, sorted by upper bound (exclusive). Workers: (physical cores below,
+# multiplier, cap, label); memory: (total GB below, label). Override both with a
+# YAML/JSON file named by DOCBUILDER_TIERS_YAML, e.g. {"workers": [[4, 2, 50, "LOW"], ...]}
+WORKER_TIERS = [
+    (4, 2, 50, "⚠️  LOW-END"),
+    (8, 3, 100, "🥉 MEDIUM"),
+    (16, 4, 200, "🥈 MEDIUM-HIGH"),
+    (float("inf"), 6, 300, "🏆 HIGH-END"),
+]
+MEMORY_TIERS = [
+    (8, "⚠️  LIMITED"),
+    (16, "🥉 ADEQUATE"),
+    (32, "🥈 GOOD"),
+    (float("inf"), "🏆 EXCELLENT"),
+]
+
+# Assumed PDF size until finished documents can be measured
+DEFAULT_DOC_BYTES = 100 * 1024
+
+# Seconds a disk usage reading is reused before statvfs is called again
+DISK_CACHE_TTL = 5.0
+_disk_info_cache: Dict[str, Tuple[float, Tuple[int, int]]] = {}  # path -> (monotonic time, (total, free))
+
+# Below this many document directories a serial stat loop beats thread start-up
+PARALLEL_STAT_THRESHOLD = 256
+
+def _available_cpus():
+    """Number of CPUs this process may actually run on (affinity, cgroup cpuset, SLURM)"""
+    try:
+        cpus = max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:  # sched_getaffinity is Linux-only
+        cpus = cpu_count()
+    
+    # Schedulers and OpenMP-style launchers advertise the per-task budget here
+    for var in ("SLURM_CPUS_PER_TASK", "OMP_NUM_THREADS"):
+        try:
+            limit = int(os.environ.get(var, ""))
+        except ValueError:
+            continue
+        if limit > 0:
+            cpus = min(cpus, limit)
+    return cpus
+
+def _physical_cores(logical):
+    """Estimate physical (performance) cores behind `logical` usable CPUs"""
+    host_logical = psutil.cpu_count(logical=True) or logical
+    host_physical = psutil.cpu_count(logical=False) or host_logical
+    physical = max(1, round(logical * host_physical / host_logical))
+    
+    # Hybrid CPUs: efficiency cores have a max clock well below the median, so drop them
+    # and size compute-bound work by the P-core count. The current clock is no substitute
+    # (idle cores are throttled by the governor), so skip this unless every CPU reports a max
+    try:
+        freqs = psutil.cpu_freq(percpu=True) or []
+    except (AttributeError, NotImplementedError, OSError):
+        freqs = []
+    if len(freqs) > 1 and all(f.max for f in freqs):
+        max_freqs = sorted(f.max for f in freqs)
+        median = max_freqs[len(max_freqs) // 2]
+        slow = sum(1 for mhz in max_freqs if mhz < median * 0.7)
+        if slow:
+            physical = max(1, physical - round(slow * logical / host_logical))
+    return physical
+
+@functools.lru_cache(maxsize=1)
+def _smt_active():
+    """Whether simultaneous multithreading is on (assumed on when the kernel doesn't say)"""
+    try:
+        with open("/sys/devices/system/cpu/smt/active") as f:
+            return f.read().strip() != "0"
+    except OSError:
+        return True
+
+def _parse_cpulist(text: str) -> List[int]:
+    """Expand a kernel cpulist such as "0-3,8-11" into CPU ids"""
+    cpus: List[int] = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+@functools.lru_cache(maxsize=1)
+def _numa_nodes():
+    """{node id: usable CPU count} for NUMA nodes with CPUs this process may run on"""
+    try:
+        allowed = os.sched_getaffinity(0)
+    except AttributeError:
+        return {}
+    nodes = {}
+    for cpulist in Path("/sys/devices/system/node").glob("node[0-9]*/cpulist"):
+        try:
+            cpus = allowed.intersection(_parse_cpulist(cpulist.read_text()))
+        except (OSError, ValueError):
+            continue
+        if cpus:
+            nodes[int(cpulist.parent.name[4:])] = len(cpus)
+    return dict(sorted(nodes.items()))
+
+def _workers_per_node(workers, nodes):
+    """Split a worker count across NUMA nodes in proportion to their usable CPUs
+    
+    Uses largest-remainder apportionment so the per-node counts always add up to workers.
+    """
+    total = sum(nodes.values())
+    quotas = {node: workers * cpus / total for node, cpus in nodes.items()}
+    split = {node: int(quota) for node, quota in quotas.items()}
+    leftover = workers - sum(split.values())
+    for node in sorted(quotas, key=lambda n: quotas[n] - split[n], reverse=True)[:leftover]:
+        split[node] += 1
+    return split
+
+@functools.lru_cache(maxsize=1)
+def _tier_tables() -> Tuple[List[tuple], List[float], List[tuple], List[float]]:
+    """Worker and memory tier tables with their bisect keys, honouring DOCBUILDER_TIERS_YAML"""
+    workers, memory = WORKER_TIERS, MEMORY_TIERS
+    override_file = os.environ.get("DOCBUILDER_TIERS_YAML")
+    if override_file:
+        text = Path(override_file).read_text(encoding='utf-8')
+        try:
+            import yaml
+            override = yaml.safe_load(text)
+        except ImportError:  # JSON is valid YAML, so accept it without PyYAML
+            override = json.loads(text)
+        
+        def rows(table):
+            # A null upper bound means "and above"
+            return sorted((float("inf") if row[0] is None else row[0], *row[1:]) for row in table)
+        
+        workers = rows(override.get("workers", workers))
+        memory = rows(override.get("memory", memory))
+    return workers, [row[0] for row in workers], memory, [row[0] for row in memory]
+
+def _pick_tier(table: Sequence[tuple], bounds: Sequence[float], value: float) -> tuple:
+    """Row of a tier table whose exclusive upper bound is the first above value"""
+    return table[min(bisect.bisect_right(bounds, value), len(table) - 1)]
+
+def _output_mount():
+    """Mount point of the filesystem that OUTPUT_DIR lives (or will live) on"""
+    path = OUTPUT_DIR.resolve()
+    while not os.path.ismount(path) and path.parent != path:
+        path = path.parent
+    return str(path)
+
+def _disk_usage(path: str, ttl: float = DISK_CACHE_TTL) -> Tuple[int, int]:
+    """(total, free) bytes for the filesystem at path, via a single statvfs call
+    
+    Readings are reused for ttl seconds so repeated checks and monitors share one probe.
+    """
+    now = time.monotonic()
+    cached = _disk_info_cache.get(path)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+    
+    try:
+        st = os.statvfs(path)
+        usage = (st.f_blocks * st.f_frsize, st.f_bavail * st.f_frsize)
+    except AttributeError:  # No statvfs on Windows
+        disk = psutil.disk_usage(path)
+        usage = (disk.total, disk.free)
+    _disk_info_cache[path] = (now, usage)
+    return usage
+
+@functools.lru_cache(maxsize=1)
+def _static_specs():
+    """Probe facts that do not change while the process runs (cached)"""
+    logical_cores = _available_cpus()
+    physical_cores = _physical_cores(logical_cores)
+    total_memory_gb = psutil.virtual_memory().total / (1024**3)
+    disk_total_gb = _disk_usage(_output_mount())[0] / (1024**3)
+    return physical_cores, logical_cores, total_memory_gb, disk_total_gb
+
+def _load_average():
+    """1, 5 and 15 minute load averages, read straight from /proc on Linux"""
+    try:
+        with open("/proc/loadavg") as f:
+            return tuple(map(float, f.read().split()[:3]))
+    except OSError:  # No procfs; psutil also emulates this on Windows
+        return psutil.getloadavg()
+
+def _dynamic_specs():
+    """Probe values that change over time: available memory, free disk, load"""
+    available_memory_gb = psutil.virtual_memory().available / (1024**3)
+    free_space_gb = _disk_usage(_output_mount())[1] / (1024**3)
+    load_avg = _load_average()
+    return available_memory_gb, free_space_gb, load_avg
+
+def _cpu_model():
+    """CPU model name, used to key the throughput cache"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+@contextlib.contextmanager
+def _quiet_generator_logs():
+    """Silence the generator's per-document INFO logging while probes run"""
+    gen_logger = logging.getLogger("latex_generator")
+    previous_level = gen_logger.level
+    gen_logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        gen_logger.setLevel(previous_level)
+
+@functools.lru_cache(maxsize=1)
+def _load_sample():
+    """Generator, compiled template and data for the sample offer letter used by probes"""
+    from latex_generator import LaTeXGenerator
+    
+    with _quiet_generator_logs():
+        generator = LaTeXGenerator()
+        template = generator.compile_template(Path("offer-letters/template.tex").read_text(encoding='utf-8'))
+        data = generator.load_json_data("offer-letters/data.json")
+    return generator, template, data
+
+@functools.lru_cache(maxsize=1)
+def _probe_doc_memory_mb():
+    """Peak memory for one sample document in MB: the render plus the Tectonic process"""
+    if resource is None or shutil.which("tectonic") is None:
+        return None
+    try:
+        generator, template, data = _load_sample()
+    except OSError:
+        return None
+    
+    # Python-side render cost; leave tracing alone if the caller already runs tracemalloc
+    if tracemalloc.is_tracing():
+        before, _ = tracemalloc.get_traced_memory()
+        rendered = template.render(data)
+        render_bytes = max(0, tracemalloc.get_traced_memory()[0] - before)
+        del rendered
+    else:
+        tracemalloc.start()
+        try:
+            template.render(data)
+            render_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    
+    # Tectonic dominates the working set. RUSAGE_CHILDREN reports the peak RSS of the
+    # largest child reaped so far, which after this compile is at least Tectonic's own peak
+    with _quiet_generator_logs(), tempfile.TemporaryDirectory() as tmp:
+        if not generator.compile_template_to_pdf(template, data, tmp, "probe",
+                                                 work_dir=Path("offer-letters").resolve()):
+            return None
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    child_bytes = child_rss if sys.platform == "darwin" else child_rss * 1024  # KB on Linux
+    return (render_bytes + child_bytes) / (1024**2)
+
+@functools.lru_cache(maxsize=4)
+def _probe_throughput(total_memory_gb, n=8):
+    """Measure single-worker docs/second by compiling sample offer letters with Tectonic"""
+    key = f"{_cpu_model()}|{total_memory_gb:.0f}GB"
+    try:
+        cache = json.loads(THROUGHPUT_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    if key in cache:
+        return cache[key]
+    
+    if shutil.which("tectonic") is None:
+        return None
+    
+    try:
+        generator, template, data = _load_sample()
+    except OSError:
+        return None
+    resources_dir = Path("offer-letters").resolve()
+    
+    batch_sizes, latencies = [], []
+    with _quiet_generator_logs(), tempfile.TemporaryDirectory() as tmp:
+        for batch in (b for b in (1, 2, 4, 8) if b <= n):
+            start = time.perf_counter()
+            for i in range(batch):
+                if not generator.compile_template_to_pdf(template, data, tmp, f"probe_{i}",
+                                                         work_dir=resources_dir):
+                    return None
+            batch_sizes.append(batch)
+            latencies.append(time.perf_counter() - start)
+    
+    # The slope of latency over batch size is the marginal cost of one document; the
+    # intercept soaks up one-off warmup such as Tectonic's bundle and font caches
+    # (least squares by hand; statistics.linear_regression needs Python 3.10)
+    seconds_per_doc = 0
+    if len(batch_sizes) > 1:
+        mean_x, mean_y = statistics.mean(batch_sizes), statistics.mean(latencies)
+        seconds_per_doc = (sum((x - mean_x) * (y - mean_y) for x, y in zip(batch_sizes, latencies))
+                           / sum((x - mean_x) ** 2 for x in batch_sizes))
+    if seconds_per_doc <= 0:
+        seconds_per_doc = latencies[-1] / batch_sizes[-1]
+    docs_per_sec = 1 / seconds_per_doc
+    
+    # Write to a temp file and rename it into place, so concurrent probes never leave
+    # a half-written cache behind (the last writer wins)
+    cache[key] = docs_per_sec
+    try:
+        THROUGHPUT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=THROUGHPUT_CACHE_FILE.parent, suffix=".tmp",
+                                         delete=False) as f:
+            f.write(json.dumps(cache, indent=2))
+        os.replace(f.name, THROUGHPUT_CACHE_FILE)
+    except OSError:
+        pass
+    return docs_per_sec
+
+@functools.lru_cache(maxsize=32)
+def recommend(cores: int, logical: int, mem_gb: float, free_gb: float,
+              per_doc_bytes: float = DEFAULT_DOC_BYTES, smt_active: bool = True) -> Dict[str, Any]:
+    """Pure recommendation kernel: worker count, tiers and disk status from probed specs
+    
+    Args are physical cores, usable logical CPUs, total memory (GB), free disk (GB),
+    the expected size of one PDF in bytes and whether SMT is on. The result is cached,
+    so treat the returned dict as read-only. Fully annotated and free of I/O so the
+    module can be compiled with mypyc (`mypyc system_specs.py`) if startup cost matters.
+    """
+    # Tiers follow physical cores (SMT siblings share execution units); hyperthreads
+    # only add I/O headroom, one extra worker per sibling rather than a full tier's worth
+    worker_tiers, worker_bounds, memory_tiers, memory_bounds = _tier_tables()
+    smt_headroom = min(max(logical - cores, 0), cores)
+    _, multiplier, cap, performance_tier = _pick_tier(worker_tiers, worker_bounds, cores)
+    recommended_workers = min(int(cores * multiplier) + smt_headroom, cap)
+    
+    # Per-stage pools: CPU-bound rendering gets one worker per physical core, I/O-bound
+    # writes oversubscribe to hide latency (less so without SMT siblings to absorb stalls)
+    cpu_workers = cores
+    io_workers = min(cores * (8 if smt_active else 4), 256)
+    
+    _, memory_tier = _pick_tier(memory_tiers, memory_bounds, mem_gb)
+    
+    estimated_size_gb = 10000 * per_doc_bytes / (1024**3)
+    if free_gb >= estimated_size_gb * 2:
+        disk_status = "✅ SUFFICIENT"
+    elif free_gb >= estimated_size_gb:
+        disk_status = "⚠️  MINIMAL"
+    else:
+        disk_status = "❌ INSUFFICIENT"
+    
+    return {
+        'recommended_workers': recommended_workers,
+        'cpu_workers': cpu_workers,
+        'io_workers': io_workers,
+        'performance_tier': performance_tier,
+        'memory_tier': memory_tier,
+        'disk_status': disk_status,
+        'estimated_size_gb': estimated_size_gb,
+    }
+
+def check_system_specs(verbose=True, per_doc_bytes=None, probe=None):
+    """Check system specifications and recommend optimal settings
+    
+    The report is collected and written in one go; pass verbose=False to only get the dict.
+    per_doc_bytes is the measured PDF size (see sample_pdf_bytes); a 100KB guess is used
+    without it. probe (defaults to verbose) runs the sample-compile measurements behind
+    batch size and speed; they run at most once per process. Worker initialisers should
+    keep verbose=False so they never launch Tectonic.
+    """
+    if probe is None:
+        probe = verbose
+    out = []
+    out.append("🖥️  SYSTEM SPECIFICATIONS")
+    out.append("="*50)
+    
+    physical_cores, cpu_cores, total_memory_gb, disk_total_gb = _static_specs()
+    available_memory_gb, free_space_gb, load_avg = _dynamic_specs()
     
     # CPU Information
-    cpu_cores = cpu_count()
-    print(f"🔧 CPU Cores: {cpu_cores}")
+    out.append(f"🔧 CPU Cores: {cpu_cores} available ({cpu_count()} on host)")
+    out.append(f"🔧 Physical Cores: {physical_cores}")
     
     # Memory Information
-    memory = psutil.virtual_memory()
-    total_memory_gb = memory.total / (1024**3)
-    available_memory_gb = memory.available / (1024**3)
-    print(f"💾 Total Memory: {total_memory_gb:.1f} GB")
-    print(f"💾 Available Memory: {available_memory_gb:.1f} GB")
+    out.append(f"💾 Total Memory: {total_memory_gb:.1f} GB")
+    out.append(f"💾 Available Memory: {available_memory_gb:.1f} GB")
     
     # Disk Space
-    disk_usage = psutil.disk_usage('/')
-    free_space_gb = disk_usage.free / (1024**3)
-    print(f"💽 Free Disk Space: {free_space_gb:.1f} GB")
+    out.append(f"💽 Free Disk Space: {free_space_gb:.1f} GB of {disk_total_gb:.1f} GB on {_output_mount()}")
     
     # System Load
-    load_avg = psutil.getloadavg()
-    print(f"📊 System Load: {load_avg[0]:.2f}, {load_avg[1]:.2f}, {load_avg[2]:.2f}")
+    out.append(f"📊 System Load: {load_avg[0]:.2f}, {load_avg[1]:.2f}, {load_avg[2]:.2f}")
     
-    print("\n" + "="*50)
-    print("🚀 PERFORMANCE RECOMMENDATIONS")
-    print("="*50)
+    out.append("\n" + "="*50)
+    out.append("🚀 PERFORMANCE RECOMMENDATIONS")
+    out.append("="*50)
     
     # Recommend parallel workers based on system specs
-    if cpu_cores >= 16:
-        recommended_workers = min(cpu_cores * 6, 300)
-        performance_tier = "🏆 HIGH-END"
-    elif cpu_cores >= 8:
-        recommended_workers = min(cpu_cores * 4, 200)
-        performance_tier = "🥈 MEDIUM-HIGH"
-    elif cpu_cores >= 4:
-        recommended_workers = min(cpu_cores * 3, 100)
-        performance_tier = "🥉 MEDIUM"
-    else:
-        recommended_workers = min(cpu_cores * 2, 50)
-        performance_tier = "⚠️  LOW-END"
+    rec = recommend(physical_cores, cpu_cores, total_memory_gb, free_space_gb,
+                    per_doc_bytes or DEFAULT_DOC_BYTES, _smt_active())
+    recommended_workers = rec['recommended_workers']
+    performance_tier = rec['performance_tier']
+    memory_tier = rec['memory_tier']
+    disk_status = rec['disk_status']
+    estimated_size_gb = rec['estimated_size_gb']
+    
+    out.append(f"🖥️  System Tier: {performance_tier}")
+    out.append(f"👥 Recommended Workers: {recommended_workers}")
     
-    print(f"🖥️  System Tier: {performance_tier}")
-    print(f"👥 Recommended Workers: {recommended_workers}")
+    # On multi-socket hosts, keep each worker group and its memory on one node
+    numa_nodes = _numa_nodes()
+    workers_per_node = None
+    if len(numa_nodes) > 1:
+        workers_per_node = _workers_per_node(recommended_workers, numa_nodes)
+        out.append(f"🧩 NUMA Nodes: {len(numa_nodes)} (workers per node: "
+                   f"{', '.join(str(n) for n in workers_per_node.values())})")
+        for node, workers in workers_per_node.items():
+            if not workers:
+                continue
+            out.append(f"   numactl --cpunodebind={node} --membind={node} ...  # {workers} workers")
+    out.append(f"⚙️  CPU-bound Workers: {rec['cpu_workers']} | I/O-bound Workers: {rec['io_workers']}")
     
     # Memory-based recommendations
-    if total_memory_gb >= 32:
-        memory_tier = "🏆 EXCELLENT"
-        batch_size = 100
-    elif total_memory_gb >= 16:
-        memory_tier = "🥈 GOOD"
-        batch_size = 50
-    elif total_memory_gb >= 8:
-        memory_tier = "🥉 ADEQUATE"
-        batch_size = 25
+    # Size batches from the measured per-document working set: use 85% of available
+    # memory minus what this process already holds, with 2x headroom per document
+    per_doc_mb = _probe_doc_memory_mb() if probe else None
+    out.append(f"💾 Memory Tier: {memory_tier}")
+    if per_doc_mb:
+        overhead_mb = psutil.Process().memory_info().rss / (1024**2)
+        budget_mb = available_memory_gb * 1024 * 0.85 - overhead_mb
+        batch_size = max(1, min(int(budget_mb / (per_doc_mb * 2)), 10000))
+        out.append(f"📦 Recommended Batch Size: {batch_size} ({per_doc_mb:.2f} MB per document)")
     else:
-        memory_tier = "⚠️  LIMITED"
-        batch_size = 10
-    
-    print(f"💾 Memory Tier: {memory_tier}")
-    print(f"📦 Recommended Batch Size: {batch_size}")
+        batch_size = None
+        if probe:
+            out.append("⚠️  Could not measure per-document memory (needs Tectonic and the offer-letters sample)")
     
     # Disk space check
-    estimated_size_gb = 10000 * 0.1  # Rough estimate: 100KB per document
-    if free_space_gb >= estimated_size_gb * 2:
-        disk_status = "✅ SUFFICIENT"
-    elif free_space_gb >= estimated_size_gb:
-        disk_status = "⚠️  MINIMAL"
-    else:
-        disk_status = "❌ INSUFFICIENT"
-    
-    print(f"💽 Disk Status: {disk_status}")
-    print(f"📊 Estimated Space Needed: {estimated_size_gb:.1f} GB")
+    out.append(f"💽 Disk Status: {disk_status}")
+    size_source = "measured" if per_doc_bytes else "assumed"
+    out.append(f"📊 Estimated Space Needed: {estimated_size_gb:.1f} GB "
+               f"({(per_doc_bytes or DEFAULT_DOC_BYTES) / 1024:.0f} KB per document, {size_source})")
     
     # Performance predictions
-    print("\n" + "="*50)
-    print("⏱️  PERFORMANCE PREDICTIONS")
-    print("="*50)
-    
-    # Based on system tier, estimate performance
-    if performance_tier == "🏆 HIGH-END":
-        estimated_docs_per_sec = 25-50
-        estimated_time_min = 3.5-7
-    elif performance_tier == "🥈 MEDIUM-HIGH":
-        estimated_docs_per_sec = 15-25
-        estimated_time_min = 7-11
-    elif performance_tier == "🥉 MEDIUM":
-        estimated_docs_per_sec = 8-15
-        estimated_time_min = 11-20
+    out.append("\n" + "="*50)
+    out.append("⏱️  PERFORMANCE PREDICTIONS")
+    out.append("="*50)
+    
+    # Measure one worker, then scale by physical cores since compilation is CPU-bound
+    per_worker_rate = _probe_throughput(total_memory_gb) if probe else None
+    if per_worker_rate:
+        estimated_docs_per_sec = per_worker_rate * physical_cores
+        estimated_time_min = 10000 / estimated_docs_per_sec / 60
+        out.append(f"🚀 Estimated Speed: {estimated_docs_per_sec:.1f} docs/second (measured)")
+        out.append(f"⏰ Estimated Time: {estimated_time_min:.1f} minutes for 10,000 documents")
     else:
-        estimated_docs_per_sec = 3-8
-        estimated_time_min = 20-55
+        estimated_docs_per_sec = None
+        estimated_time_min = None
+        if probe:
+            out.append("⚠️  Could not measure throughput (is Tectonic installed?)")
     
-    print(f"🚀 Estimated Speed: {estimated_docs_per_sec} docs/second")
-    print(f"⏰ Estimated Time: {estimated_time_min} minutes for 10,000 documents")
+    if verbose:
+        sys.stdout.write("\n".join(out) + "\n")
     
     return {
         'cpu_cores': cpu_cores,
+        'physical_cores': physical_cores,
         'total_memory_gb': total_memory_gb,
         'available_memory_gb': available_memory_gb,
         'free_space_gb': free_space_gb,
+        'disk_total_gb': disk_total_gb,
         'recommended_workers': recommended_workers,
+        'cpu_workers': rec['cpu_workers'],
+        'io_workers': rec['io_workers'],
+        'workers_per_node': workers_per_node,
         'batch_size': batch_size,
+        'per_doc_mb': per_doc_mb,
         'performance_tier': performance_tier,
         'memory_tier': memory_tier,
         'disk_status': disk_status,
+        'estimated_size_gb': estimated_size_gb,
         'estimated_docs_per_sec': estimated_docs_per_sec,
         'estimated_time_min': estimated_time_min
     }
 
-def check_current_test_progress():
-    """Check progress of current running test"""
-    output_dir = Path("scale_test_output")
+def _scan_documents(output_dir):
+    """Return (doc_dirs, finished) for every doc_* directory, finished[i] meaning data.pdf exists"""
+    # List document directories in one pass; is_dir() uses the dirent type, so only the
+    # data.pdf lookups cost a stat()
+    with os.scandir(output_dir) as entries:
+        doc_dirs = [
+            entry.path for entry in entries
+            if entry.name.startswith("doc_") and entry.is_dir(follow_symlinks=False)
+        ]
+    pdf_paths = [os.path.join(doc_dir, "data.pdf") for doc_dir in doc_dirs]
     
-    if not output_dir.exists():
-        print("❌ No current test running (scale_test_output not found)")
+    # Issue the stats concurrently for large runs so slow or networked filesystems
+    # overlap their round trips (os.stat releases the GIL)
+    if len(pdf_paths) >= PARALLEL_STAT_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            finished = list(executor.map(os.path.exists, pdf_paths, chunksize=64))
+    else:
+        finished = list(map(os.path.exists, pdf_paths))
+    return doc_dirs, finished
+
+def sample_pdf_bytes(output_dir=OUTPUT_DIR, k=32):
+    """Median size of the first k finished PDFs under output_dir, or None if there are none"""
+    sizes = []
+    try:
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("doc_") and entry.is_dir(follow_symlinks=False)):
+                    continue
+                try:
+                    sizes.append(os.stat(os.path.join(entry.path, "data.pdf")).st_size)
+                except FileNotFoundError:
+                    continue
+                if len(sizes) >= k:
+                    break
+    except FileNotFoundError:
         return None
+    return statistics.median(sizes) if sizes else None
+
+class ProgressWatcher:
+    """Running count of finished documents, kept up to date by inotify instead of re-scanning
+    
+    Scans once on creation, then only reads change events, so poll() is cheap enough for
+    sub-second monitoring. Requires Linux and the optional inotify_simple package. Removed
+    or renamed doc_* folders drop out of the count. If the output directory itself goes
+    away, the inotify watch limit is reached or the kernel drops events, it falls back to
+    re-scanning on every poll() so the count stays correct.
+    """
+    
+    def __init__(self, output_dir=OUTPUT_DIR):
+        if INotify is None:
+            raise RuntimeError("ProgressWatcher needs inotify_simple (pip install inotify_simple)")
+        
+        self.output_dir = str(output_dir)
+        self._inotify = INotify()
+        self._scanning = False
+        self._finished = set()
+        self._doc_dirs = {}  # watch descriptor -> document directory
+        
+        # Watch the root first so directories created during the scan are not missed
+        try:
+            self._root_wd = self._inotify.add_watch(
+                self.output_dir,
+                inotify_flags.CREATE | inotify_flags.MOVED_TO | inotify_flags.DELETE
+                | inotify_flags.MOVED_FROM | inotify_flags.ONLYDIR)
+        except OSError as e:
+            if e.errno != errno.ENOSPC:
+                raise
+            self._fall_back_to_scanning()
+            return
+        doc_dirs, finished = _scan_documents(self.output_dir)
+        for doc_dir, done in zip(doc_dirs, finished):
+            if done:
+                self._finished.add(doc_dir)
+            else:
+                self._watch_doc_dir(doc_dir)
+    
+    @property
+    def count(self) -> int:
+        return len(self._finished)
+    
+    def _fall_back_to_scanning(self):
+        """Stop trusting inotify (root gone, watch limit hit or events dropped) and count by scanning"""
+        self._scanning = True
+        self._doc_dirs.clear()
+        self._inotify.close()
+        self._rescan()
+    
+    def _rescan(self):
+        try:
+            doc_dirs, finished = _scan_documents(self.output_dir)
+        except FileNotFoundError:  # Removed between runs; counts again once it is recreated
+            doc_dirs, finished = [], []
+        self._finished = {doc_dir for doc_dir, done in zip(doc_dirs, finished) if done}
+    
+    def _watch_doc_dir(self, doc_dir):
+        if self._scanning:
+            return
+        try:
+            wd = self._inotify.add_watch(doc_dir, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+        except OSError as e:
+            if e.errno != errno.ENOENT:  # ENOSPC: out of watches (fs.inotify.max_user_watches)
+                self._fall_back_to_scanning()
+            return  # ENOENT: the directory was removed again
+        self._doc_dirs[wd] = doc_dir
+        # The PDF may have landed before the watch existed
+        if os.path.exists(os.path.join(doc_dir, "data.pdf")):
+            self._mark_finished(wd)
+    
+    def _mark_finished(self, wd):
+        doc_dir = self._doc_dirs.pop(wd, None)
+        if doc_dir is not None:
+            self._finished.add(doc_dir)
+            self._inotify.rm_watch(wd)
     
-    # Count generated PDFs
-    pdf_count = 0
-    for doc_dir in output_dir.glob("doc_*"):
-        if doc_dir.is_dir():
-            pdf_file = doc_dir / "data.pdf"
-            if pdf_file.exists():
-                pdf_count += 1
+    def _forget_doc_dir(self, doc_dir):
+        """Drop a removed or renamed document directory from the count and the watch list"""
+        self._finished.discard(doc_dir)
+        for wd, watched in list(self._doc_dirs.items()):
+            if watched == doc_dir:
+                del self._doc_dirs[wd]
+                try:
+                    self._inotify.rm_watch(wd)
+                except OSError:
+                    pass  # The kernel already dropped the watch along with the directory
+    
+    def poll(self):
+        """Apply pending events without blocking and return the finished count"""
+        if self._scanning:
+            self._rescan()
+            return self.count
+        
+        for event in self._inotify.read(timeout=0):
+            if event.mask & inotify_flags.Q_OVERFLOW:
+                # The kernel queue overflowed and events were lost; the count can't be trusted
+                self._fall_back_to_scanning()
+                break
+            if event.wd == self._root_wd:
+                if event.mask & inotify_flags.IGNORED:
+                    # The output directory was deleted or unmounted; a recreated one needs
+                    # a fresh watch, so count by scanning from here on
+                    self._fall_back_to_scanning()
+                    break
+                if event.mask & inotify_flags.ISDIR and event.name.startswith("doc_"):
+                    doc_dir = os.path.join(self.output_dir, event.name)
+                    if event.mask & (inotify_flags.DELETE | inotify_flags.MOVED_FROM):
+                        self._forget_doc_dir(doc_dir)
+                    else:
+                        self._watch_doc_dir(doc_dir)
+            elif event.mask & inotify_flags.IGNORED:
+                # Watch removed by the kernel (document directory deleted) or by rm_watch
+                self._doc_dirs.pop(event.wd, None)
+            elif event.name == "data.pdf":
+                self._mark_finished(event.wd)
+        return self.count
+    
+    def close(self):
+        self._inotify.close()
+
+def check_current_test_progress(watcher=None):
+    """Check progress of current running test (pass a ProgressWatcher to avoid a full scan)"""
+    output_dir = OUTPUT_DIR
+    
+    if watcher is not None:
+        pdf_count = watcher.poll()
+    elif not output_dir.exists():
+        print("❌ No current test running (scale_test_output not found)")
+        return None
+    else:
+        pdf_count = sum(_scan_documents(output_dir)[1])
     
     progress = (pdf_count / 10000) * 100
     
@@ -142,13 +694,46 @@ def check_current_test_progress():
     
     return pdf_count
 
+def watch_progress(interval=1.0):
+    """Report progress every interval seconds until all 10,000 documents exist (Ctrl-C stops)
+    
+    Uses a ProgressWatcher when inotify_simple is installed, so each report costs only the
+    pending change events instead of a full scan.
+    """
+    watcher = None
+    pdf_count = None
+    try:
+        while True:
+            if watcher is None and INotify is not None and OUTPUT_DIR.exists():
+                watcher = ProgressWatcher()
+            pdf_count = check_current_test_progress(watcher)
+            if pdf_count is not None and pdf_count >= 10000:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if watcher is not None:
+            watcher.close()
+    return pdf_count
+
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Check system specs and current test progress")
+    parser.add_argument('--watch', type=float, nargs='?', const=1.0, metavar='SECONDS',
+                        help='Keep reporting progress every SECONDS (default: 1) until the run completes')
+    args = parser.parse_args()
+    if args.watch is not None:
+        if args.watch <= 0:
+            parser.error(f"--watch must be positive (got {args.watch})")
+        watch_progress(args.watch)
+        return
+    
     print("🔍 SYSTEM ANALYSIS FOR OFFER LETTERS GENERATION")
     print("="*60)
     
-    # Check system specs
-    specs = check_system_specs()
+    # Check system specs, sizing the disk estimate from PDFs already produced
+    specs = check_system_specs(per_doc_bytes=sample_pdf_bytes())
     
     print("\n" + "="*60)
     
@@ -172,7 +757,7 @@ def main():
     print("="*60)
     print("1. Run ultra_fast_offer_letters_test.py for maximum speed")
     print("2. Use the recommended settings above")
-    print("3. Monitor progress with monitor_scale_test.py")
+    print("3. Monitor progress with: python system_specs.py --watch")
     print("4. Consider running multiple tests in parallel if you have the resources")
 
 if __name__ == "__main__":